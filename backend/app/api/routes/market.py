@@ -1,12 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from typing import AsyncIterator, Iterator, List
+from app.core.config import settings
 from app.core.security import get_current_user
 from app.models.user import User
-from app.schemas.user import StockQuote, MarketIndex, NewsItem
+from app.schemas.user import StockQuote, MarketIndex, NewsItem, HistoricalExportRequest
 from app.services.market_data import MarketDataService
+from app.services.historical_export import EXPORT_MEDIA_TYPES, open_historical_export
 
 router = APIRouter(prefix="/market", tags=["Market Data"])
 
+async def _close_on_exit(iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Iterate a blocking stream off the event loop and always close it,
+    even when the client disconnects mid-download"""
+    try:
+        async for chunk in iterate_in_threadpool(iterator):
+            yield chunk
+    finally:
+        iterator.close()
+
 @router.get("/indices", response_model=List[MarketIndex])
 async def get_indices(current_user: User = Depends(get_current_user)):
     """Get major market indices"""
@@ -30,6 +43,36 @@ async def get_gainers_losers(current_user: User = Depends(get_current_user)):
     data = MarketDataService.get_top_gainers_losers()
     return data
 
+@router.post("/historical/export")
+async def export_historical_data(
+    request: HistoricalExportRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Bulk export historical data for many symbols
+    
+    Streams CSV, Parquet or NDJSON one symbol at a time, fetching
+    up to EXPORT_MAX_WORKERS symbols concurrently. Symbols without data
+    are left out; NDJSON ends with an error record listing them.
+    """
+    symbols = list(dict.fromkeys(s.strip() for s in request.symbols if s.strip()))
+    if not symbols:
+        raise HTTPException(status_code=400, detail="No symbols provided")
+    
+    content = await run_in_threadpool(
+        open_historical_export,
+        symbols, request.period, request.format, settings.EXPORT_MAX_WORKERS
+    )
+    if content is None:
+        raise HTTPException(status_code=404, detail="No historical data found")
+    
+    filename = f"historical_{request.period}.{request.format}"
+    return StreamingResponse(
+        _close_on_exit(content),
+        media_type=EXPORT_MEDIA_TYPES[request.format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.get("/historical/{symbol}")
 async def get_historical_data(
     symbol: str,
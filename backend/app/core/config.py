@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from typing import Optional
 import os
@@ -11,6 +12,7 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int 
     NEWS_API_KEY: str
+    EXPORT_MAX_WORKERS: int = Field(default=8, ge=1)
     class Config:
         env_file = ".env"
 
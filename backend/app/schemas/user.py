@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 class UserBase(BaseModel):
@@ -54,4 +54,9 @@ class NewsItem(BaseModel):
     url: str
     source: str
     published_at: str
-    image_url: Optional[str] = None
\ No newline at end of file
+    image_url: Optional[str] = None
+
+class HistoricalExportRequest(BaseModel):
+    symbols: List[str] = Field(..., min_length=1, max_length=500)
+    period: str = Field(default="1y", pattern="^(1d|5d|1mo|3mo|6mo|1y|5y)$")
+    format: Literal["csv", "parquet", "ndjson"] = "csv"
\ No newline at end of file
@@ -0,0 +1,193 @@
+import csv
+import io
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.services.market_data import MarketDataService
+
+HISTORY_COLUMNS = ["symbol", "date", "open", "high", "low", "close", "volume"]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def iter_symbol_histories(
+    symbols: Iterable[str], period: str, max_workers: int = 8
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Fetch historical data for many symbols concurrently, in request order.
+
+    At most ``max_workers`` symbols are in flight at any time, so at most
+    ``max_workers + 1`` histories (the pending ones plus the one the
+    consumer last received) are held in memory no matter how long the
+    symbol list is, provided the consumer keeps no earlier histories.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        pending = deque()
+        for symbol in symbols:
+            if len(pending) >= max_workers:
+                done_symbol, future = pending.popleft()
+                yield done_symbol, future.result()
+            pending.append(
+                (symbol, executor.submit(MarketDataService.get_historical_data, symbol, period))
+            )
+        while pending:
+            done_symbol, future = pending.popleft()
+            yield done_symbol, future.result()
+    finally:
+        # Don't join workers that may be mid-download when the consumer
+        # stops early (e.g. the client disconnected).
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def stream_csv(histories: Iterable[Tuple[str, List[Dict[str, Any]]]]) -> Iterator[bytes]:
+    """Serialize histories as CSV, one chunk per symbol"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HISTORY_COLUMNS)
+    yield buffer.getvalue().encode("utf-8")
+
+    for symbol, rows in histories:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in rows:
+            writer.writerow([
+                symbol, row["date"], row["open"], row["high"],
+                row["low"], row["close"], row["volume"]
+            ])
+        yield buffer.getvalue().encode("utf-8")
+
+
+def stream_ndjson(histories: Iterable[Tuple[str, List[Dict[str, Any]]]]) -> Iterator[bytes]:
+    """Serialize histories as newline-delimited JSON, one chunk per symbol"""
+    for symbol, rows in histories:
+        lines = [json.dumps({"symbol": symbol, **row}) for row in rows]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _ParquetSink:
+    """Write-only file object that hands written bytes back to the caller.
+
+    Parquet files end with a footer, so the writer still needs a file-like
+    target; this one keeps only the bytes written since the last ``drain``.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_parquet(histories: Iterable[Tuple[str, List[Dict[str, Any]]]]) -> Iterator[bytes]:
+    """Serialize histories as Parquet, one row group per symbol"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("symbol", pa.string()),
+        ("date", pa.string()),
+        ("open", pa.float64()),
+        ("high", pa.float64()),
+        ("low", pa.float64()),
+        ("close", pa.float64()),
+        ("volume", pa.int64()),
+    ])
+
+    sink = _ParquetSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for symbol, rows in histories:
+            columns = {name: [row[name] for row in rows] for name in HISTORY_COLUMNS[1:]}
+            columns["symbol"] = [symbol] * len(rows)
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+EXPORT_SERIALIZERS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+    "parquet": stream_parquet,
+}
+
+
+def open_historical_export(
+    symbols: Iterable[str], period: str, fmt: str, max_workers: int = 8
+) -> Optional[Iterator[bytes]]:
+    """Start streaming historical data for many symbols in the requested format.
+
+    Symbols are fetched up to the first one that has data, so callers can
+    still answer 404 before any bytes are sent. Returns None when none of
+    the symbols has data.
+    """
+    histories = iter_symbol_histories(symbols, period, max_workers)
+    skipped: List[str] = []
+    for symbol, rows in histories:
+        if rows:
+            # Hand the first history over through an iterator so nothing
+            # keeps it alive once it has been serialized
+            return _stream_export(histories, chain(iter([(symbol, rows)]), histories), skipped, fmt)
+        skipped.append(symbol)
+    return None
+
+
+def _stream_export(
+    source: Iterator[Tuple[str, List[Dict[str, Any]]]],
+    histories: Iterator[Tuple[str, List[Dict[str, Any]]]],
+    skipped: List[str],
+    fmt: str,
+) -> Iterator[bytes]:
+    def with_data():
+        for symbol, rows in histories:
+            if rows:
+                yield symbol, rows
+            else:
+                skipped.append(symbol)
+
+    try:
+        yield from EXPORT_SERIALIZERS[fmt](with_data())
+    finally:
+        source.close()
+
+    if skipped:
+        print(f"Historical export skipped symbols with no data: {', '.join(skipped)}")
+        # NDJSON is the only format that can carry the report in-band
+        if fmt == "ndjson":
+            record = {"error": "No historical data found", "skipped": skipped}
+            yield (json.dumps(record) + "\n").encode("utf-8")
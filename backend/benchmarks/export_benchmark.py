@@ -0,0 +1,126 @@
+"""Memory and throughput benchmark for the bulk historical export.
+
+Run from the backend directory:
+
+    python -m benchmarks.export_benchmark --symbols 500 --workers 8
+
+Historical data is synthesized (about 5 years of trading days per symbol)
+with a fixed per-symbol delay standing in for the upstream fetch, so the
+numbers are reproducible without network access.
+
+Each case runs in a fresh process so that peak RSS and Arrow's native
+memory pool peak (which tracemalloc can't see) belong to that case alone.
+Within a case, throughput comes from an untraced pass and the Python
+peak from a second pass under tracemalloc, since tracing slows
+allocation enough to distort the timing.
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from app.services import historical_export
+from app.services.market_data import MarketDataService
+
+TRADING_DAYS_5Y = 1250
+
+
+def synthetic_history(symbol: str, period: str, latency: float) -> List[Dict[str, Any]]:
+    time.sleep(latency)
+    start = date(2020, 1, 1)
+    return [
+        {
+            "date": (start + timedelta(days=i)).strftime("%Y-%m-%d"),
+            "open": 100.0 + i * 0.01,
+            "high": 101.0 + i * 0.01,
+            "low": 99.0 + i * 0.01,
+            "close": 100.5 + i * 0.01,
+            "volume": 1_000_000 + i,
+        }
+        for i in range(TRADING_DAYS_5Y)
+    ]
+
+
+def run_loop_baseline(symbols: List[str]) -> int:
+    """Per-symbol loop that materializes every history as JSON, as clients do today"""
+    payloads = []
+    for symbol in symbols:
+        payloads.append(json.dumps(MarketDataService.get_historical_data(symbol, "5y")))
+    return sum(len(p) for p in payloads)
+
+
+def run_export(symbols: List[str], fmt: str, workers: int) -> int:
+    total = 0
+    for chunk in historical_export.open_historical_export(symbols, "5y", fmt, workers):
+        total += len(chunk)
+    return total
+
+
+def run_case(case: str, args: argparse.Namespace, results) -> None:
+    import pyarrow as pa
+
+    MarketDataService.get_historical_data = staticmethod(
+        lambda symbol, period="1mo": synthetic_history(symbol, period, args.latency)
+    )
+    symbols = [f"SYM{i:04d}.NS" for i in range(args.symbols)]
+
+    def run() -> int:
+        if case == "loop":
+            return run_loop_baseline(symbols)
+        return run_export(symbols, case, args.workers)
+
+    started = time.perf_counter()
+    size = run()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    run()
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results.put({
+        "elapsed": elapsed,
+        "symbols_per_sec": len(symbols) / elapsed,
+        "output_bytes": size,
+        "python_peak": python_peak,
+        "arrow_peak": pa.default_memory_pool().max_memory(),
+        # ru_maxrss is reported in kilobytes on Linux
+        "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    })
+
+
+def measure(name: str, case: str, args: argparse.Namespace) -> None:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=run_case, args=(case, args, results))
+    process.start()
+    result = results.get()
+    process.join()
+    print(
+        f"{name:<18} {result['elapsed']:8.2f}s {result['symbols_per_sec']:10.1f} sym/s "
+        f"{result['output_bytes'] / 1e6:10.1f} MB out "
+        f"{result['python_peak'] / 1e6:10.1f} MB py peak "
+        f"{result['arrow_peak'] / 1e6:10.1f} MB arrow peak "
+        f"{result['max_rss'] / 1e6:10.1f} MB max RSS"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="simulated per-symbol fetch latency in seconds")
+    args = parser.parse_args()
+
+    measure("loop (json)", "loop", args)
+    for fmt in ("csv", "ndjson", "parquet"):
+        measure(f"export ({fmt})", fmt, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import gc
+import io
+import json
+import time
+import weakref
+
+import pyarrow.parquet as pq
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import market
+from app.core.security import get_current_user
+from app.services import historical_export
+from app.services.market_data import MarketDataService
+
+
+def make_history(symbol, days=3):
+    return [
+        {
+            "date": f"2024-01-{day:02d}",
+            "open": 100.0 + day,
+            "high": 101.0 + day,
+            "low": 99.0 + day,
+            "close": 100.5 + day,
+            "volume": 1000 * day,
+        }
+        for day in range(1, days + 1)
+    ]
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """Serve synthetic history; symbols starting with "BAD" have no data"""
+    calls = []
+
+    def get_historical_data(symbol, period="1mo"):
+        calls.append(symbol)
+        return [] if symbol.startswith("BAD") else make_history(symbol)
+
+    monkeypatch.setattr(MarketDataService, "get_historical_data", staticmethod(get_historical_data))
+    return calls
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(market.router)
+    app.dependency_overrides[get_current_user] = lambda: None
+    return TestClient(app)
+
+
+def export(symbols, fmt, max_workers=4):
+    return b"".join(historical_export.open_historical_export(symbols, "5y", fmt, max_workers))
+
+
+def test_parquet_round_trip_has_one_row_group_per_symbol(fetched):
+    data = export(["AAA.NS", "BBB.NS", "CCC.NS"], "parquet")
+
+    parquet_file = pq.ParquetFile(io.BytesIO(data))
+    assert parquet_file.num_row_groups == 3
+    for index, symbol in enumerate(["AAA.NS", "BBB.NS", "CCC.NS"]):
+        group = parquet_file.read_row_group(index)
+        assert set(group.column("symbol").to_pylist()) == {symbol}
+
+    table = pq.read_table(io.BytesIO(data))
+    assert table.num_rows == 9
+    assert table.column("close").to_pylist()[:3] == [101.5, 102.5, 103.5]
+    assert table.column("volume").to_pylist()[:3] == [1000, 2000, 3000]
+
+
+def test_output_follows_request_order_under_concurrent_fetch(monkeypatch):
+    symbols = [f"SYM{i}" for i in range(8)]
+
+    def get_historical_data(symbol, period="1mo"):
+        # Later symbols finish first
+        time.sleep(0.01 * (len(symbols) - symbols.index(symbol)))
+        return make_history(symbol, days=1)
+
+    monkeypatch.setattr(MarketDataService, "get_historical_data", staticmethod(get_historical_data))
+
+    lines = export(symbols, "ndjson", max_workers=4).decode().splitlines()
+    assert [json.loads(line)["symbol"] for line in lines] == symbols
+
+
+def test_stream_holds_a_bounded_number_of_histories(monkeypatch):
+    class Rows(list):
+        pass
+
+    alive = {}
+
+    def get_historical_data(symbol, period="1mo"):
+        rows = Rows(make_history(symbol, days=1))
+        alive[symbol] = weakref.ref(rows)
+        return rows
+
+    monkeypatch.setattr(MarketDataService, "get_historical_data", staticmethod(get_historical_data))
+
+    max_workers = 2
+    stream = historical_export.open_historical_export(
+        [f"SYM{i}" for i in range(20)], "5y", "ndjson", max_workers
+    )
+    for index, _ in enumerate(stream):
+        if index == 10:
+            gc.collect()
+            held = [symbol for symbol, ref in alive.items() if ref() is not None]
+            assert "SYM0" not in held
+            assert len(held) <= max_workers + 1
+
+
+def test_skipped_symbols_are_reported(fetched):
+    lines = export(["BAD1", "AAA.NS", "BAD2"], "ndjson").decode().splitlines()
+
+    assert {json.loads(line)["symbol"] for line in lines[:-1]} == {"AAA.NS"}
+    assert json.loads(lines[-1]) == {"error": "No historical data found", "skipped": ["BAD1", "BAD2"]}
+
+    rows = export(["BAD1", "AAA.NS", "BAD2"], "csv").decode().splitlines()
+    assert rows[0] == ",".join(historical_export.HISTORY_COLUMNS)
+    assert len(rows) == 4 and all(row.startswith("AAA.NS,") for row in rows[1:])
+
+
+def test_no_data_for_any_symbol(fetched):
+    assert historical_export.open_historical_export(["BAD1", "BAD2"], "5y", "csv") is None
+
+
+def test_route_dedupes_and_drops_blank_symbols(fetched, client):
+    response = client.post(
+        "/market/historical/export",
+        json={"symbols": ["AAA.NS", " ", "BBB.NS", "AAA.NS", " BBB.NS "], "period": "5y", "format": "csv"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert sorted(fetched) == ["AAA.NS", "BBB.NS"]
+    assert len(response.text.splitlines()) == 1 + 2 * 3
+
+
+def test_route_returns_404_when_no_symbol_has_data(fetched, client):
+    response = client.post(
+        "/market/historical/export",
+        json={"symbols": ["BAD1", "BAD2"], "format": "ndjson"},
+    )
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "No historical data found"}
+
+
+def test_route_rejects_only_blank_symbols(fetched, client):
+    response = client.post("/market/historical/export", json={"symbols": ["", " "]})
+
+    assert response.status_code == 400
+    assert fetched == []